@@ -1,65 +1,89 @@
 import argparse
+import functools
+import io
+import itertools
+import mmap
 import pathlib as pl
 import re
 import shlex
+import shutil
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Any, Generator
+from typing import Any, Generator, TextIO
 
 import humanize
-import numpy as np
 import pandas as pd
 
 from . import utils
 
 # REGEXES
 
-# Logfile
-RX_TIMESTAMP = re.compile(r"^\d{6}-\d{2}:\d{2}:\d{2},\d{1,3}")
-RX_CPAC_COMMAND = re.compile(r"^\s*Run command: (.*)$")
-RX_CPAC_VERSION = re.compile(r"^\s*C-PAC version: (.*)$")
-RX_CPAC_END_PIPELINE_CONFIG = re.compile(r"^\s*Pipeline configuration: (.*)$")
-RX_CPAC_END_SUBJECT_WORKFLOW = re.compile(r"^\s*Subject workflow: (.*)$")
-
-RC_CPAC_END_SUCCESS = re.compile(r"^\s*CPAC run complete:\s*$")
-RC_CPAC_END_SUCCESS_TEST_CONFIG = re.compile(
-    r"^\s*This has been a tests? of the pipeline configuration file, "
-    r"the pipeline was built successfully, but was not run\s*$"
+# Logfile (bytes patterns, logs are scanned memory-mapped)
+RX_TIMESTAMP = re.compile(rb"^\d{6}-\d{2}:\d{2}:\d{2},\d{1,3}", re.MULTILINE)
+# All control line patterns fused into one alternation, the named group that matched
+# (`Match.lastgroup`) tells which kind of line it is. Timestamps are not part of it,
+# they are on almost every line and only the first and last one are needed.
+RX_LINE = re.compile(
+    rb"^\s*Run command: (?P<command>.*?)\r?$"
+    rb"|^\s*C-PAC version: (?P<version>.*?)\r?$"
+    rb"|^\s*Pipeline configuration: (?P<pipeline_config>.*?)\r?$"
+    rb"|^\s*Subject workflow: (?P<subject_workflow>.*?)\r?$"
+    rb"|(?P<success>^\s*CPAC run complete:\s*$)"
+    rb"|(?P<success_test_config>^\s*This has been a tests? of the pipeline configuration file, "
+    rb"the pipeline was built successfully, but was not run\s*$)"
+    rb"|(?P<error>^\s*CPAC run error:\s*$)",
+    re.MULTILINE,
 )
-RC_CPAC_END_ERROR = re.compile(r"^\s*CPAC run error:\s*$")
 
 RX_CPAC_PIPELINE_CONFIG_COMMAND_FALLBACK = re.compile(r"--preconfig\s*(\S+)")
 
 RX_CPAC_ERROR1_LOOKUP = re.compile(
-    r"LookupError: When trying to connect node block '([^']+)' "
-    r"to workflow '([^']+)' "
-    r"after node block '([^']+)':\s+\[!] "
-    r"C-PAC says: None of the listed resources are "
-    r"in the resource pool:\s+" + "([^\n]*)"
+    rb"LookupError: When trying to connect node block '([^']+)' "
+    rb"to workflow '([^']+)' "
+    rb"after node block '([^']+)':\s+\[!] "
+    rb"C-PAC says: None of the listed resources are "
+    rb"in the resource pool:\s+([^\r\n]*)"
 )
 RX_CPAC_ERROR2_LOOKUP = re.compile(
-    r"LookupError: When trying to connect node block '([^']+)' "
-    r"to workflow '([^']+)' "
-    r"after node block '([^']+)':\s+\[!] "
-    r"C-PAC says: None of the listed resources "
-    r"in the node block being connected exist "
-    r"in the resource pool\.\s+Resources:\s+" + "([^\n]*)"
+    rb"LookupError: When trying to connect node block '([^']+)' "
+    rb"to workflow '([^']+)' "
+    rb"after node block '([^']+)':\s+\[!] "
+    rb"C-PAC says: None of the listed resources "
+    rb"in the node block being connected exist "
+    rb"in the resource pool\.\s+Resources:\s+([^\r\n]*)"
 )
 RX_CPAC_ERROR3_LOOKUP = re.compile(
-    r"LookupError: When trying to connect one of the node blocks \[([^]]+)] "
-    r"to workflow '([^']+)' "
-    r"after node block '([^']+)':\s+\[!] "
-    r"C-PAC says: None of the listed resources are "
-    r"in the resource pool:\s+" + "([^\n]*)"
+    rb"LookupError: When trying to connect one of the node blocks \[([^]]+)] "
+    rb"to workflow '([^']+)' "
+    rb"after node block '([^']+)':\s+\[!] "
+    rb"C-PAC says: None of the listed resources are "
+    rb"in the resource pool:\s+([^\r\n]*)"
 )
+CPAC_ERROR_LOOKUP_PREFIX = b"LookupError: When trying to connect "
 RXS_CPAC_ERROR_LOOKUP = [RX_CPAC_ERROR1_LOOKUP, RX_CPAC_ERROR2_LOOKUP, RX_CPAC_ERROR3_LOOKUP]
+RXS_CPAC_ERROR_LOOKUP_SEARCH = [rx.search for rx in RXS_CPAC_ERROR_LOOKUP]
+
+# 192 pipeline configs
+RX_GEN192_PIPELINE_CONFIG = re.compile(
+    r"^(?P<id>[^_]*)_[^_]*"
+    r"_[^_-]*-(?P<base_pipeline>[^_]*)"
+    r"_[^_-]*-(?P<perturb_pipeline>[^_]*)"
+    r"_[^_-]*-(?P<step>[^_]*)"
+    r"_[^_-]*-(?P<connectivity>[^_]*)"
+    r"_[^_-]*-(?P<nuisance>[^_]*)$"
+)
 
-TEMPLATE_REPORT_MD = """# CPAC run report\n
+# Report is written in two parts with the run details streamed in between
+TEMPLATE_REPORT_MD_HEAD = """# CPAC run report\n
 {header}\n
 ## Summary\n
 {summary}\n
 ## Details\n
-{details}\n
+"""
+
+TEMPLATE_REPORT_MD_TAIL = """\n
 <hr>\n
 {footer}\n
 """
@@ -68,12 +92,17 @@ TEMPLATE_ENTRY_MD = """### {title}\n
 {details}\n
 """
 
-TEMPLATE_SPOILER_MD = """<details>
+# Head and tail are also used on their own to stream large details (crashfiles)
+TEMPLATE_SPOILER_MD_HEAD = """<details>
 <summary>{summary}</summary>\n
-{details}\n
+"""
+
+TEMPLATE_SPOILER_MD_TAIL = """\n
 </details>
 """
 
+TEMPLATE_SPOILER_MD = TEMPLATE_SPOILER_MD_HEAD + "{details}" + TEMPLATE_SPOILER_MD_TAIL
+
 
 def find_log_files(root: pl.Path) -> Generator[pl.Path, None, None]:
     """Find all log files in the given directory recursively."""
@@ -94,6 +123,32 @@ def find_crash_files(log_file: pl.Path) -> Generator[pl.Path, None, None]:
     return log_file.parent.glob("../../crash-*.txt")
 
 
+def _parse_timestamp(stamp: bytes) -> datetime:
+    """Parse a log timestamp (`%y%m%d-%H:%M:%S,%f`) without the overhead of `datetime.strptime`."""
+    year = int(stamp[0:2])
+    return datetime(
+        year + (1900 if year >= 69 else 2000),
+        int(stamp[2:4]),
+        int(stamp[4:6]),
+        int(stamp[7:9]),
+        int(stamp[10:12]),
+        int(stamp[13:15]),
+        # fraction is right padded like strptime's %f does
+        int(stamp[16:].ljust(6, b"0")),
+    )
+
+
+def _find_last_timestamp(log_data: mmap.mmap | bytes, first: re.Match[bytes]) -> re.Match[bytes]:
+    """Find the last timestamp by walking lines backwards from the end of the log, down to the first one."""
+    end = len(log_data)
+    while end > first.end():
+        start = log_data.rfind(b"\n", 0, end - 1) + 1
+        if match := RX_TIMESTAMP.match(log_data, start):
+            return match
+        end = start
+    return first
+
+
 @dataclass
 class CpacRun:
     base_dir: pl.Path
@@ -110,74 +165,71 @@ class CpacRun:
     start: datetime | None = None
     diff: timedelta | None = None
     success: bool = False
-    crashfiles: list[pl.Path] | None = None
+    failed_to_start: bool = False
+
+    @functools.cached_property
+    def crashfiles(self) -> list[pl.Path] | None:
+        """Crash files of the run, only looked up (once) for failed runs that have a log file."""
+        if self.failed_to_start:
+            return None
+        if self.success:
+            return []
+        return list(find_crash_files(self.file))
 
     @classmethod
     def from_failed_to_start_file(cls, failed_to_start_file: pl.Path, base_dir: pl.Path) -> "CpacRun":
-        return cls(base_dir, failed_to_start_file, str(failed_to_start_file.relative_to(base_dir)))
+        return cls(
+            base_dir, failed_to_start_file, str(failed_to_start_file.relative_to(base_dir)), failed_to_start=True
+        )
 
     @classmethod
     def from_log_file(cls, log_file: pl.Path, base_dir: pl.Path) -> "CpacRun":
         run = cls(base_dir, log_file, "PLACEHOLDER")
 
-        min_time = None
-        max_time = None
-
         cpac_success = False
         cpac_error = False
 
-        log_text = ""
-
-        # read line by line
-        with open(log_file, "r", encoding="UTF-8") as f:
-            while line := f.readline():
-                log_text += line
-                # match with regex
-                if match := re.match(RX_TIMESTAMP, line):
-                    # convert to datetime object
-                    stamp = datetime.strptime(match.group(), "%y%m%d-%H:%M:%S,%f")
-
-                    if min_time is None or stamp < min_time:
-                        min_time = stamp
-                    if max_time is None or stamp > max_time:
-                        max_time = stamp
-
-                elif match := re.match(RX_CPAC_COMMAND, line):
-                    run.command = match.group(1)
+        with utils.map_file(log_file) as log_data:
+            # single pass over the whole log, only control lines are yielded
+            for match in RX_LINE.finditer(log_data):
+                kind = match.lastgroup
+                if kind == "command":
+                    run.command = match.group(kind).decode("UTF-8")
                     run.test_config = " test_config " in run.command
-                elif match := re.match(RX_CPAC_VERSION, line):
-                    run.version = match.group(1)
-                elif match := re.match(RX_CPAC_END_PIPELINE_CONFIG, line):
-                    run.pipeline_config = match.group(1)
-                elif match := re.match(RX_CPAC_END_SUBJECT_WORKFLOW, line):
-                    run.subject_workflow = match.group(1)
-                elif (match := re.match(RC_CPAC_END_SUCCESS, line)) or (
-                    run.test_config and (match := re.match(RC_CPAC_END_SUCCESS_TEST_CONFIG, line))
-                ):
+                elif kind == "version":
+                    run.version = match.group(kind).decode("UTF-8")
+                elif kind == "pipeline_config":
+                    run.pipeline_config = match.group(kind).decode("UTF-8")
+                elif kind == "subject_workflow":
+                    run.subject_workflow = match.group(kind).decode("UTF-8")
+                elif kind == "success" or (kind == "success_test_config" and run.test_config):
                     cpac_success = True
-                elif match := re.match(RC_CPAC_END_ERROR, line):
+                elif kind == "error":
                     cpac_error = True
 
-        if cpac_error or not cpac_success:
-            for rx_error in RXS_CPAC_ERROR_LOOKUP:
-                if match := re.search(rx_error, log_text):
-                    run.error_info = {
-                        "node_block": match.group(1),
-                        "target_work_flow": match.group(2),
-                        "previous_node_block": match.group(3),
-                        "missing_resources": match.group(4),
-                    }
-                    break
-
-        # calculate difference
-        if max_time is not None and min_time is not None:
-            run.diff = max_time - min_time
-        run.start = min_time
+            # only failed runs with a lookup error pay for the error regexes,
+            # which are started at the first occurrence of their common prefix
+            if (cpac_error or not cpac_success) and (error_pos := log_data.find(CPAC_ERROR_LOOKUP_PREFIX)) != -1:
+                for search_error in RXS_CPAC_ERROR_LOOKUP_SEARCH:
+                    if error_match := search_error(log_data, error_pos):
+                        run.error_info = {
+                            "node_block": error_match.group(1).decode("UTF-8"),
+                            "target_work_flow": error_match.group(2).decode("UTF-8"),
+                            "previous_node_block": error_match.group(3).decode("UTF-8"),
+                            "missing_resources": error_match.group(4).decode("UTF-8"),
+                        }
+                        break
+
+            # calculate difference (log messages are chronological)
+            if first_stamp := RX_TIMESTAMP.search(log_data):
+                last_stamp = _find_last_timestamp(log_data, first_stamp)
+                run.start = _parse_timestamp(first_stamp.group())
+                run.diff = _parse_timestamp(last_stamp.group()) - run.start
 
         # fallback to command line argument or filename
         if run.pipeline_config is None and run.command is not None:
             run.pipeline_config = (
-                fb.group(1) if (fb := re.search(RX_CPAC_PIPELINE_CONFIG_COMMAND_FALLBACK, run.command)) else None
+                fb.group(1) if (fb := RX_CPAC_PIPELINE_CONFIG_COMMAND_FALLBACK.search(run.command)) else None
             )
         if run.pipeline_config is None:
             run.pipeline_config = str(log_file.relative_to(base_dir))
@@ -185,8 +237,6 @@ class CpacRun:
         if run.error_info is not None:
             run.error_info["pipeline_config"] = run.pipeline_config
 
-        run.crashfiles = list(find_crash_files(log_file))
-
         run.success = cpac_success and not cpac_error
 
         run.title = run.pipeline_config
@@ -207,16 +257,21 @@ class CpacRun:
         }
 
     @classmethod
-    def crashfile_to_md(cls, crashfile: pl.Path) -> str:
-        crashfile_content = ""
+    def crashfile_to_md(cls, crashfile: pl.Path, out: TextIO) -> None:
+        out.write(TEMPLATE_SPOILER_MD_HEAD.format(summary=f"Crashfile <code>{crashfile.name}</code>"))
+        out.write("```Python\n")
+        # copied in chunks, crashfiles are never held in memory as a whole
         with open(crashfile, "r") as f:
-            crashfile_content = f.read()
-        return TEMPLATE_SPOILER_MD.format(
-            summary=f"Crashfile <code>{crashfile.name}</code>",
-            details=f"```Python\n{crashfile_content}```",
-        )
+            shutil.copyfileobj(f, out)
+        out.write("```")
+        out.write(TEMPLATE_SPOILER_MD_TAIL)
 
     def md_report(self) -> str:
+        out = io.StringIO()
+        self.write_md_report(out)
+        return out.getvalue()
+
+    def write_md_report(self, out: TextIO) -> None:
         out_dict = {
             "File": f"`{self.file.absolute()}`",
             "Start": self.start,
@@ -228,25 +283,29 @@ class CpacRun:
             "Success": utils.bool_to_emoji(self.success),
         }
 
-        details_md = TEMPLATE_ENTRY_MD.format(
-            title=self.title,
-            details=pd.DataFrame({"Key": out_dict.keys(), "Value": out_dict.values()}).to_markdown(index=False),
+        out.write(
+            TEMPLATE_ENTRY_MD.format(
+                title=self.title,
+                details=utils.dict_to_markdown_table(out_dict),
+            )
         )
 
-        crashfiles_md = (
-            "\n".join([CpacRun.crashfile_to_md(crashfile) for crashfile in self.crashfiles]) if self.crashfiles else ""
-        )
+        for i, crashfile in enumerate(self.crashfiles or []):
+            if i > 0:
+                out.write("\n")
+            CpacRun.crashfile_to_md(crashfile, out)
 
         if not self.success:
             logfile_tail = utils.file_tail(self.file, 100)
 
-            crashfiles_md += "\n" + TEMPLATE_SPOILER_MD.format(
-                summary="Last 100 lines of logfile",
-                details=f"```log\n{logfile_tail}```",
+            out.write("\n")
+            out.write(
+                TEMPLATE_SPOILER_MD.format(
+                    summary="Last 100 lines of logfile",
+                    details=f"```log\n{logfile_tail}```",
+                )
             )
 
-        return details_md + crashfiles_md
-
 
 def _gen192_table_proc(df: pd.DataFrame) -> pd.DataFrame:
     df = df.copy()
@@ -260,26 +319,19 @@ def _gen192_table_proc(df: pd.DataFrame) -> pd.DataFrame:
     # sub-NDARINV2VY7YYNW_ses-baselineYear1Arm1/pypeline.log
     #
     # delete everything after first / in pipeline_configh
-    df["pipeline_config"] = df["pipeline_config"].str.split("/").str[0]
+    df["pipeline_config"] = df["pipeline_config"].str.partition("/")[0]
 
     # 010_p010_base-abcd_perturb-ccs_step-functional-masking_conn-nilearn_nuisance-true
 
-    # split pipeline_config into 3 columns
-    df[["id", "pid", "base_pipeline", "perturb_pipeline", "step", "connectivity", "nuisance"]] = df[
-        "pipeline_config"
-    ].str.split("_", expand=True)
+    # extract id (dropping pid) and the values of the "key-value" parts in one pass
+    df = df.join(df["pipeline_config"].str.extract(RX_GEN192_PIPELINE_CONFIG))
 
-    # drop pid
-    df = df.drop("pid", axis=1)
-
-    # remove everything up to first dash in "base_pipeline", "perturb_pipeline", "step", "connectivity", "nuisance"
-    df["base_pipeline"] = df["base_pipeline"].str.split("-", n=1).str[1]
-    df["perturb_pipeline"] = df["perturb_pipeline"].str.split("-", n=1).str[1]
-    df["step"] = df["step"].str.split("-", n=1).str[1]
-    df["connectivity"] = df["connectivity"].str.split("-", n=1).str[1]
-    df["nuisance"] = df["nuisance"].str.split("-", n=1).str[1]
-
-    # reorder columns
+    # collapse rows where 'missing_resources', 'node_block', 'previous_node_block' are same
+    # into the first one and add count of duplicates as column
+    # (head(1) keeps first-appearance order, which is also the group order of size() with sort=False)
+    error_columns = ["missing_resources", "node_block", "previous_node_block"]
+    groups = df.groupby(error_columns, sort=False, dropna=False)
+    df = groups.head(1).assign(number_of_pipelines_with_this_error=groups.size().to_numpy())
     df = df[
         [
             "id",
@@ -288,19 +340,11 @@ def _gen192_table_proc(df: pd.DataFrame) -> pd.DataFrame:
             "step",
             "connectivity",
             "nuisance",
-            "missing_resources",
-            "node_block",
-            "previous_node_block",
+            *error_columns,
+            "number_of_pipelines_with_this_error",
         ]
     ]
 
-    # remove rows where 'missing_resources', 'node_block', 'previous_node_block' are same
-    # and add count of duplicates as column
-    df["number_of_pipelines_with_this_error"] = df.groupby(["missing_resources", "node_block", "previous_node_block"])[
-        "id"
-    ].transform("count")
-    df = df.drop_duplicates(subset=["missing_resources", "node_block", "previous_node_block"], keep="first")
-
     # save to csv
     df.to_csv("data_clean.csv", index=False)
     # Replace _ with space in column names
@@ -309,7 +353,7 @@ def _gen192_table_proc(df: pd.DataFrame) -> pd.DataFrame:
 
 
 class CpacRunCollection:
-    def __init__(self, search_path: pl.Path, base_path: pl.Path) -> None:
+    def __init__(self, search_path: pl.Path, base_path: pl.Path, max_workers: int | None = None) -> None:
         self.search_path = search_path
         self.base_path = base_path
 
@@ -319,7 +363,11 @@ class CpacRunCollection:
         # (i.e. the pipeline was started but crashed before generating a log directory)
         runs_failed_to_start = [f for f in files_fts if not any(f.parent == f2.parent for f2 in files_log)]
 
-        self.runs: list[CpacRun] = [CpacRun.from_log_file(f, base_path) for f in find_log_files(search_path)]
+        # log files are independent, parse them in parallel (max_workers=None uses all cores)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            self.runs: list[CpacRun] = list(
+                executor.map(CpacRun.from_log_file, files_log, itertools.repeat(base_path), chunksize=8)
+            )
         self.runs += [CpacRun.from_failed_to_start_file(f, base_path) for f in runs_failed_to_start]
         # simplified unique titles
         simplified_titles = utils.unique_substrings([r.title for r in self.runs])
@@ -329,20 +377,32 @@ class CpacRunCollection:
         self.runs.sort(key=lambda x: x.title)
 
     def report_md(self, include_gen192_table: bool = False) -> str:
-        records = [r.record() for r in self.runs]
-
-        df_overview = pd.DataFrame.from_records(records)
+        out = io.StringIO()
+        self.write_report_md(out, include_gen192_table=include_gen192_table)
+        return out.getvalue()
+
+    def write_report_md(self, out: TextIO, include_gen192_table: bool = False) -> None:
+        # only the columns the report uses, built column-wise
+        df_overview = pd.DataFrame(
+            {
+                "title": [r.title for r in self.runs],
+                "duration": [r.diff for r in self.runs],
+                "success": [r.success for r in self.runs],
+            }
+        )
         df_overview["success_state"] = df_overview["success"]
-        df_overview["success"] = np.where(df_overview["success"], utils.HTML_SYMBOL_SUCCESS, utils.HTML_SYMBOL_FAILURE)
+        df_overview["success"] = df_overview["success"].map(
+            {True: utils.HTML_SYMBOL_SUCCESS, False: utils.HTML_SYMBOL_FAILURE}
+        )
 
         # Set to pipeline_config or file if no pipeline_config is available
-        df_overview["title"] = df_overview["title"].apply(lambda x: utils.markdown_heading_to_link(x))
+        df_overview["title"] = df_overview["title"].map(utils.markdown_heading_to_link)
 
         slowest_pipeline_duration = df_overview["duration"].max()
         # Set None durations to 0
         df_overview["duration"] = df_overview["duration"].fillna(timedelta(0))
         # humanize duration
-        df_overview["duration"] = df_overview["duration"].apply(lambda x: humanize.naturaldelta(x))
+        df_overview["duration"] = df_overview["duration"].map(humanize.naturaldelta)
 
         # Overview table
         md_table_overview = df_overview[["title", "duration", "success"]].to_markdown(index=False)
@@ -366,18 +426,29 @@ class CpacRunCollection:
             f"Pipelines found under <code>{self.search_path}</code>.\n\n"
         )
 
+        md_summary = md_table_overview + ("" if md_table_gen192_errors is None else ("\n\n" + md_table_gen192_errors))
+        out.write(TEMPLATE_REPORT_MD_HEAD.format(header=md_intro_text, summary=md_summary))
+
+        # Run details
+        for i, run in enumerate(self.runs):
+            if i > 0:
+                out.write("\n")
+            run.write_md_report(out)
+
         # Footer
         md_footer = f"*Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*"
+        out.write(TEMPLATE_REPORT_MD_TAIL.format(footer=md_footer))
 
-        # Run details
-        md_details = "\n".join([x.md_report() for x in self.runs])
 
-        return TEMPLATE_REPORT_MD.format(
-            header=md_intro_text,
-            footer=md_footer,
-            summary=md_table_overview + ("" if md_table_gen192_errors is None else ("\n\n" + md_table_gen192_errors)),
-            details=md_details,
-        )
+def _positive_int(value: str) -> int:
+    """Argparse type for integers greater than 0."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: '{value}'") from None
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"must be greater than 0, got {number}")
+    return number
 
 
 def make_parser() -> argparse.ArgumentParser:
@@ -387,19 +458,26 @@ def make_parser() -> argparse.ArgumentParser:
     parser.add_argument(
         "--gen192", action="store_true", help="Generate a missing resource report for the 192 pipeline configs."
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=_positive_int,
+        help="Number of log files parsed in parallel (default: number of CPUs).",
+        required=False,
+    )
     return parser
 
 
 def main() -> None:
     args = make_parser().parse_args()
     path_searchdir = pl.Path(args.path)
-    md_report = CpacRunCollection(path_searchdir, path_searchdir).report_md(include_gen192_table=args.gen192)
+    collection = CpacRunCollection(path_searchdir, path_searchdir, args.jobs)
 
     if args.output:
         with open(args.output, "w", encoding="UTF-8") as f:
-            f.write(md_report)
+            collection.write_report_md(f, include_gen192_table=args.gen192)
     else:
-        print(md_report)
+        collection.write_report_md(sys.stdout, include_gen192_table=args.gen192)
 
 
 if __name__ == "__main__":
@@ -1,7 +1,24 @@
+import contextlib
+import io
+import mmap
+import os
 import pathlib as pl
-import re
+import string
+from typing import Any, Iterator
 
-_RX_MARKDOWN_HEADING_ID_LEGAL_CHARS = re.compile(r"[^0-9a-z_-]")
+_MARKDOWN_HEADING_ID_LEGAL_CHARS = frozenset(string.digits + string.ascii_lowercase + "_-")
+
+
+class _MarkdownHeadingIdTable(dict[int, int | None]):
+    """`str.translate` table deleting illegal id chars, filled on first lookup of each code point."""
+
+    def __missing__(self, code_point: int) -> int | None:
+        value = code_point if chr(code_point) in _MARKDOWN_HEADING_ID_LEGAL_CHARS else None
+        self[code_point] = value
+        return value
+
+
+_MARKDOWN_HEADING_ID_TABLE = _MarkdownHeadingIdTable()
 
 HTML_SYMBOL_SUCCESS = "&#9989;"  # check mark
 HTML_SYMBOL_FAILURE = "&#10060;"  # cross mark
@@ -12,16 +29,45 @@ def bool_to_emoji(x: bool) -> str:
     return HTML_SYMBOL_SUCCESS if x else HTML_SYMBOL_FAILURE
 
 
-def file_tail(file: pl.Path, n: int = 10) -> str:
-    """Return the last n lines of a file."""
-    with open(file, "r", encoding="UTF-8") as f:
-        lines = f.readlines()
-        return "".join(lines[-n:])
+def file_tail(file: pl.Path, n: int = 10, block_size: int = 8192) -> str:
+    """Return the last n lines of a file (reads blocks from the end instead of the whole file)."""
+    with open(file, "rb") as f:
+        end = pos = f.seek(0, os.SEEK_END)
+        # n + 1 line breaks, as the last line usually ends with one
+        newlines = 0
+        while pos > 0 and newlines <= n:
+            size = min(block_size, pos)
+            pos -= size
+            f.seek(pos)
+            newlines += f.read(size).count(b"\n")
+        f.seek(pos)
+        # the first block may start in the middle of a character, but that line is cut off anyway
+        tail = f.read(end - pos).decode("UTF-8", errors="replace")
+    lines = io.StringIO(tail, newline=None).readlines()
+    return "".join(lines[-n:])
+
+
+@contextlib.contextmanager
+def map_file(file: pl.Path) -> Iterator[mmap.mmap | bytes]:
+    """Memory-map a file read-only. Empty files (which can not be mapped) yield empty bytes."""
+    with open(file, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b""
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield mm
+
+
+def dict_to_markdown_table(d: dict[str, Any], key_header: str = "Key", value_header: str = "Value") -> str:
+    """Render a dict as a two column Markdown table (`None` values are left empty)."""
+    rows = [f"| {key_header} | {value_header} |", "|:---|:---|"]
+    rows += [f"| {k} | {'' if v is None else v} |" for k, v in d.items()]
+    return "\n".join(rows)
 
 
 def _markdown_heading_to_id(heading: str) -> str:
     """Convert a markdown heading to a valid id to link to via (my link)[#id]."""
-    return _RX_MARKDOWN_HEADING_ID_LEGAL_CHARS.sub("", heading.lower())
+    return heading.lower().translate(_MARKDOWN_HEADING_ID_TABLE)
 
 
 def markdown_heading_to_link(heading: str, title: str | None = None) -> str:
@@ -0,0 +1,149 @@
+import pathlib as pl
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+import clmunch.clmunch
+
+LOG_SUCCESS = """\
+  Run command: run.py /in /out participant --preconfig abcd-options
+  C-PAC version: 1.8.6
+231201-10:00:00,5 nipype.workflow INFO:
+\t [Node] Setting-up "anat_preproc"
+231201-10:30:15,123 nipype.workflow INFO:
+\t [Node] Finished "anat_preproc"
+  Pipeline configuration: cpac_abcd-options
+  Subject workflow: cpac_sub-1_ses-1
+  CPAC run complete:
+"""
+
+LOG_ERROR = """\
+  Run command: run.py /in /out participant
+231201-10:00:00,000 nipype.workflow INFO:
+LookupError: When trying to connect node block 'nb' to workflow 'wf' after node block 'prev':
+
+[!] C-PAC says: None of the listed resources are in the resource pool:
+  desc-brain_bold
+  CPAC run error:
+"""
+
+
+def _write_log(tmp_path: pl.Path, text: str) -> pl.Path:
+    log_file = tmp_path / "output" / "log" / "pipeline" / "sub-1" / "pypeline.log"
+    log_file.parent.mkdir(parents=True)
+    log_file.write_text(text)
+    return log_file
+
+
+def test_from_log_file_success(tmp_path: pl.Path) -> None:
+    run = clmunch.clmunch.CpacRun.from_log_file(_write_log(tmp_path, LOG_SUCCESS), tmp_path)
+
+    assert run.success
+    assert run.command == "run.py /in /out participant --preconfig abcd-options"
+    assert run.version == "1.8.6"
+    assert run.pipeline_config == "cpac_abcd-options"
+    assert run.subject_workflow == "cpac_sub-1_ses-1"
+    assert run.start == datetime(2023, 12, 1, 10, 0, 0, 500000)
+    assert run.diff == timedelta(minutes=30, seconds=14, microseconds=623000)
+    assert run.error_info is None
+
+
+def test_from_log_file_error(tmp_path: pl.Path) -> None:
+    log_file = _write_log(tmp_path, LOG_ERROR)
+    run = clmunch.clmunch.CpacRun.from_log_file(log_file, tmp_path)
+
+    assert not run.success
+    assert run.pipeline_config == str(log_file.relative_to(tmp_path))
+    assert run.diff == timedelta(0)
+    assert run.error_info == {
+        "node_block": "nb",
+        "target_work_flow": "wf",
+        "previous_node_block": "prev",
+        "missing_resources": "desc-brain_bold",
+        "pipeline_config": run.pipeline_config,
+    }
+
+
+def test_gen192_table_proc(tmp_path: pl.Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)  # writes data_clean.csv
+    error_info = {
+        "target_work_flow": "wf",
+        "missing_resources": "desc-brain_bold",
+        "node_block": "nb",
+        "previous_node_block": "prev",
+    }
+    df = pd.DataFrame.from_records(
+        [
+            {
+                **error_info,
+                "pipeline_config": "010_p010_base-abcd_perturb-ccs_step-functional-masking_conn-nilearn_nuisance-true/"
+                "sub-1/output/log/pipeline_p010/sub-1_ses-1/pypeline.log",
+            },
+            {
+                **error_info,
+                "pipeline_config": "011_p011_base-abcd_perturb-fmriprep_step-anat_conn-afni_nuisance-false/"
+                "sub-1/output/log/pipeline_p011/sub-1_ses-1/pypeline.log",
+            },
+            {**error_info, "missing_resources": "space-template_bold", "pipeline_config": "cpac_default_x/a"},
+            {
+                **error_info,
+                "missing_resources": "space-template_bold",
+                "pipeline_config": "012_p012_base-abc_perturb-x_step-y_conn-z_nuisance-true/a",
+            },
+        ]
+    )
+
+    df = clmunch.clmunch._gen192_table_proc(df)
+
+    # NaN -> None for comparison
+    assert df.astype(object).where(df.notna(), None).to_dict("records") == [
+        {
+            "id": "010",
+            "base pipeline": "abcd",
+            "perturb pipeline": "ccs",
+            "step": "functional-masking",
+            "connectivity": "nilearn",
+            "nuisance": "true",
+            "missing resources": "desc-brain_bold",
+            "node block": "nb",
+            "previous node block": "prev",
+            "number of pipelines with this error": 2,
+        },
+        {
+            # configs not following the naming scheme are still counted,
+            # the first row of the group is kept even if later rows have values
+            "id": None,
+            "base pipeline": None,
+            "perturb pipeline": None,
+            "step": None,
+            "connectivity": None,
+            "nuisance": None,
+            "missing resources": "space-template_bold",
+            "node block": "nb",
+            "previous node block": "prev",
+            "number of pipelines with this error": 2,
+        },
+    ]
+
+
+def test_cpac_run_collection(tmp_path: pl.Path) -> None:
+    for name, text in [("a", LOG_SUCCESS), ("b", LOG_ERROR)]:
+        _write_log(tmp_path / name, text)
+    (tmp_path / "c").mkdir()
+    (tmp_path / "c" / "failedToStart.log").write_text("Traceback\n")
+
+    collection = clmunch.clmunch.CpacRunCollection(tmp_path, tmp_path, max_workers=2)
+
+    assert [run.success for run in collection.runs] == [False, False, True]
+    assert [run.file.name for run in collection.runs] == ["pypeline.log", "failedToStart.log", "pypeline.log"]
+
+
+def test_make_parser_jobs() -> None:
+    parser = clmunch.clmunch.make_parser()
+
+    assert parser.parse_args(["dir", "-j", "4"]).jobs == 4
+    assert parser.parse_args(["dir"]).jobs is None
+    for jobs in ["0", "-1", "x"]:
+        with pytest.raises(SystemExit):
+            parser.parse_args(["dir", "-j", jobs])
@@ -1,3 +1,5 @@
+import pathlib as pl
+
 import clmunch.utils
 
 
@@ -15,3 +17,32 @@ def test_unique_substrings() -> None:
     assert clmunch.utils.unique_substrings(["a", "aa"]) == ["a", "aa"]
     assert clmunch.utils.unique_substrings(["aa", "a"]) == ["aa", "a"]
     assert clmunch.utils.unique_substrings(["a123", "b123", "c123"]) == ["a", "b", "c"]
+
+
+def test_file_tail(tmp_path: pl.Path) -> None:
+    file = tmp_path / "file.log"
+    lines = [f"line {i}\n" for i in range(1000)]
+    file.write_text("".join(lines))
+
+    assert clmunch.utils.file_tail(file, 3) == "".join(lines[-3:])
+    assert clmunch.utils.file_tail(file, 100, block_size=16) == "".join(lines[-100:])
+    assert clmunch.utils.file_tail(file, 2000) == "".join(lines)
+
+    file.write_text("a\nb\nc")
+    assert clmunch.utils.file_tail(file, 2) == "b\nc"
+
+    file.write_text("")
+    assert clmunch.utils.file_tail(file, 2) == ""
+
+
+def test_dict_to_markdown_table() -> None:
+    assert clmunch.utils.dict_to_markdown_table({"a": 1, "b": None}) == (
+        "| Key | Value |\n|:---|:---|\n| a | 1 |\n| b |  |"
+    )
+
+
+def test_markdown_heading_to_link() -> None:
+    assert clmunch.utils.markdown_heading_to_link("My Pipeline_01-a/b.log") == (
+        "[My Pipeline_01-a/b.log](#mypipeline_01-ablog)"
+    )
+    assert clmunch.utils.markdown_heading_to_link("Ünïcode Ä", title="x") == "[x](#ncode)"